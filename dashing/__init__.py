@@ -16,6 +16,13 @@ Any tile passed as argument at init time will be nested using the ``.items`` att
 You can easily extend Dashing with new tile types. Subclass :class:`Tile`, implement
 ``__init__`` and ``_display``.
 
+Tiles are redrawn when their content attributes (``value``, ``text``, ``title``...) are
+assigned or when ``append`` is called. After changing the content in place, like
+appending to ``datapoints`` directly, call :meth:`Tile.mark_dirty`.
+Your own tile types are redrawn on every frame. To have them skipped while unchanged,
+set ``dirty_tracking = True`` on the class and call :meth:`Tile.mark_dirty` whenever
+their content changes.
+
 The other types of tiles are:
     - :class:`Text` - simple text
     - :class:`Log` - a log pane that scrolls automatically
@@ -35,7 +42,9 @@ You can set a value at init time using the ``val`` keyword argument or access th
 
 Charts represent a sequence of values between 0 and 100 and scroll automatically.
 
-Call :meth:`display` on the root element to display or update the ui.
+Call :meth:`display` on the root element to display or update the ui. If nothing
+changed since the previous call the frame is skipped, otherwise only the tiles that
+changed or moved are drawn again.
 
 You can easily nest splits and tiles as in::
 
@@ -64,10 +73,14 @@ __version__ = "0.2.0"
 
 import colorsys
 import contextlib
+import functools
 from collections import namedtuple, deque
 import itertools
+import math
+import sys
+import time
 import warnings
-from typing import Literal, Optional, Tuple, Generator, List, Union
+from typing import Dict, Literal, Optional, Tuple, Generator, Iterator, List, Union
 
 from blessed import Terminal
 
@@ -85,6 +98,33 @@ braille_left = (0x01, 0x02, 0x04, 0x40, 0)
 braille_right = (0x08, 0x10, 0x20, 0x80, 0)
 braille_r_left = (0x04, 0x02, 0x01)
 braille_r_right = (0x20, 0x10, 0x08)
+# Runes lookup tables, precomputed as they are used for every chart cell.
+# Dot bits are disjoint so they can be OR-ed together.
+# Indexed by [left][right] dot position (-1 or 4 means "no dot")
+_braille_runes = tuple(
+    tuple(chr(0x2800 | le | ri) for ri in braille_right) for le in braille_left
+)
+# Indexed by [left][right] number of filled dots from the bottom
+_filled_braille_runes = tuple(
+    tuple(
+        chr(0x2800 | le | ri) for ri in itertools.accumulate(braille_r_right, initial=0)
+    )
+    for le in itertools.accumulate(braille_r_left, initial=0)
+)
+
+# Begin and end synchronized update: supporting terminals paint the whole frame
+# at once, avoiding tearing. Others ignore the unknown private mode.
+_sync_begin = "\x1b[?2026h"
+_sync_end = "\x1b[?2026l"
+
+# Disable and re-enable auto-wrap: drawing the last column must not make the
+# terminal wrap or scroll.
+_autowrap_off = "\x1b[?7l"
+_autowrap_on = "\x1b[?7h"
+
+# Sequences wrapping the changed cells of a frame, already encoded
+_frame_begin = (_sync_begin + _autowrap_off).encode()
+_frame_end = (_autowrap_on + _sync_end).encode()
 
 # Note: Coords start from top left.
 #   `x` is vertical       `h` is height
@@ -97,15 +137,33 @@ TBox = namedtuple("TBox", "t x y w h")
 # # Color management # #
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_color(color: str) -> Tuple[int, int, int]:
+    """Cached (r, g, b) values of a color string, see :meth:`RGB.parse`"""
+    if color.startswith("#"):
+        return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+    if color.startswith("*"):
+        h = int(color[1:3], 16) / 255.0
+        s = int(color[3:5], 16) / 255.0
+        v = int(color[5:7], 16) / 255.0
+        r, g, b = (int(c * 255) for c in colorsys.hsv_to_rgb(h, s, v))
+        return r, g, b
+
+    raise ValueError("Invalid color")
+
+
 class RGB:
     """An RGB color, stored as 3 integers"""
 
-    __slots__ = ["r", "g", "b"]
+    __slots__ = ["r", "g", "b", "_pr_cache"]
 
     def __init__(self, r: int, g: int, b: int) -> None:
         self.r = r
         self.g = g
         self.b = b
+        # (terminal, (r, g, b), escape sequence) of the last pr() call
+        self._pr_cache: Optional[tuple] = None
 
     def __iter__(self):
         yield self.r
@@ -119,16 +177,8 @@ class RGB:
             color("#RRGGBB") RGB in hex
             color("*HHSSVV") HSV in hex with values ranging 00 to FF
         """
-        if color.startswith("#"):
-            return cls(int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16))
-
-        if color.startswith("*"):
-            h = int(color[1:3], 16) / 255.0
-            s = int(color[3:5], 16) / 255.0
-            v = int(color[5:7], 16) / 255.0
-            return cls(*(int(c * 255) for c in colorsys.hsv_to_rgb(h, s, v)))
-
-        raise ValueError("Invalid color")
+        # a new instance every time: RGB objects are mutable
+        return cls(*_parse_color(color))
 
     @classmethod
     def from_hsv(cls, h: float, s: float, v: float):
@@ -152,7 +202,13 @@ class RGB:
 
     def pr(self, term) -> str:
         """Returns a printable string element"""
-        return term.color_rgb(self.r, self.g, self.b)
+        rgb = (self.r, self.g, self.b)
+        cache = self._pr_cache
+        if cache is not None and cache[0] is term and cache[1] == rgb:
+            return cache[2]
+        seq = term.color_rgb(*rgb)
+        self._pr_cache = (term, rgb, seq)
+        return seq
 
 
 # "int" is legacy
@@ -213,14 +269,22 @@ def _initcol(col: None | int | RGB | str) -> RGB | None:
 
 def interpolate_colors(high: RGB, low: RGB, steps: int, pos) -> RGB:
     """Interpolate between 2 colors. Used to generate gradients."""
-    assert steps > 0
-    start = high.to_hls()
-    end = low.to_hls()
+    col = _interpolate_colors(tuple(high), tuple(low), steps, pos)
+    return RGB(col.r, col.g, col.b)
 
+
+@functools.lru_cache(maxsize=8192)
+def _interpolate_colors(
+    high: Tuple[int, int, int], low: Tuple[int, int, int], steps: int, pos
+) -> RGB:
+    """Cached :func:`interpolate_colors`.
+    The returned RGB is shared: do not modify it.
+    """
+    assert steps > 0
     start = colorsys.rgb_to_hsv(*low)
     end = colorsys.rgb_to_hsv(*high)
 
-    # Interpolate HSL components
+    # Interpolate HSV components
     k = pos / float(steps)
     h = start[0] + (end[0] - start[0]) * k
     s = start[1] + (end[1] - start[1]) * k
@@ -233,33 +297,268 @@ def interpolate_colors(high: RGB, low: RGB, steps: int, pos) -> RGB:
     return RGB(int(r), int(g), int(b))
 
 
+@functools.lru_cache(maxsize=1024)
+def _gradient(
+    high: Tuple[int, int, int], low: Tuple[int, int, int], steps: int, n: int
+) -> Tuple[RGB, ...]:
+    """Cached first `n` colors of a gradient of `steps` steps"""
+    return tuple(_interpolate_colors(high, low, steps, pos) for pos in range(n))
+
+
 # # Tiles # #
 
 # Tiles are instantiated bottom up in order to support a friendly declarative style.
-# During display() the tree is walked recursively starting from the root.
+# During display() the tree is walked depth-first starting from the root.
 # Intermediate Tile nodes are only HSplit and VSplit. Every other type of Tile is a leaf.
 
 
 class _Buf:
-    """Output buffer for internal use"""
+    """Screen buffer for internal use
+
+    Tiles draw cells (a character and its color) with :meth:`put`. :meth:`print`
+    then sends to the terminal only the cells that changed since the previous frame.
+
+    It also memoizes the move and color escape sequences generated by the terminal,
+    which are expensive to build and get reused heavily across tiles and frames.
+    """
+
+    __slots__ = [
+        "_term",
+        "_moves",
+        "_ansi_move",
+        "_colors",
+        "width",
+        "height",
+        "_chars",
+        "_cols",
+        "_shown_chars",
+        "_shown_cols",
+        "_tail",
+        "_clip",
+    ]
+
+    def __init__(
+        self,
+        term: Terminal,
+        moves: Dict[Tuple[int, int], str],
+        colors: Dict[Tuple[int, int, int], str],
+        width: int,
+        height: int,
+    ) -> None:
+        self._term = term
+        self._moves = moves
+        # Most terminals use the plain ANSI CUP sequence: build it directly
+        self._ansi_move = term.move(4, 7) == "\x1b[5;8H"
+        self._colors = colors
+        self.width = width
+        self.height = height
+        # Cells currently on screen. None: unknown
+        self._shown_chars: List[List[Optional[str]]] = [
+            [None] * width for _ in range(height)
+        ]
+        self._shown_cols: List[List[Optional[str]]] = [
+            [None] * width for _ in range(height)
+        ]
+        self.clear()
 
-    __slots__ = ["_buf"]
+    def clear(self) -> None:
+        """Start a new frame"""
+        # Cells drawn in the current frame. None: not drawn
+        self._chars: List[List[Optional[str]]] = [
+            [None] * self.width for _ in range(self.height)
+        ]
+        self._cols: List[List[Optional[str]]] = [
+            [None] * self.width for _ in range(self.height)
+        ]
+        self._tail: List[str] = []
+        self.clip(None)
 
-    def __init__(self) -> None:
-        self._buf: List[str] = []
+    def clip(self, tbox: Optional[TBox]) -> None:
+        """Clip the following draws to the area of `tbox`, or to the screen if None"""
+        if tbox is None:
+            self._clip = (0, 0, self.height, self.width)
+        else:
+            self._clip = (
+                max(tbox.x, 0),
+                max(tbox.y, 0),
+                min(tbox.x + tbox.h, self.height),
+                min(tbox.y + tbox.w, self.width),
+            )
+
+    def put(self, x: int, y: int, text: str, col: str) -> None:
+        """Draw `text` starting from `x`, `y` using the color sequence `col`
+        (from :meth:`color`)
+        """
+        self.put_cells(x, y, text, [col] * len(text))
+
+    def put_cells(self, x: int, y: int, text: str, cols: List[str]) -> None:
+        """Draw `text` starting from `x`, `y` using a color sequence for each cell
+        (from :meth:`color`). Anything falling out of the clip area is dropped.
+        """
+        top, left, bottom, right = self._clip
+        if not top <= x < bottom:
+            return
+        if y < left:
+            text, cols, y = text[left - y :], cols[left - y :], left
+        end = min(y + len(text), right)
+        if end <= y:
+            return
+        self._chars[x][y:end] = text[: end - y]
+        self._cols[x][y:end] = cols[: end - y]
+
+    def put_column(self, x: int, y: int, text: str, col: str) -> None:
+        """Draw `text` downwards starting from `x`, `y` using the color sequence
+        `col`. Anything falling out of the clip area is dropped.
+        """
+        top, left, bottom, right = self._clip
+        if not left <= y < right:
+            return
+        for row in range(max(x, top), min(x + len(text), bottom)):
+            self._chars[row][y] = text[row - x]
+            self._cols[row][y] = col
 
     def add(self, *i: str) -> None:
-        """Append string to buffer"""
-        self._buf.extend(i)
+        """Append raw sequences to be printed after the cells"""
+        self._tail.extend(i)
+
+    def move(self, x: int, y: int) -> str:
+        """Returns the (cached) sequence to move the cursor to `x`, `y`"""
+        try:
+            return self._moves[(x, y)]
+        except KeyError:
+            if self._ansi_move:
+                seq = f"\x1b[{x + 1};{y + 1}H"
+            else:
+                seq = self._term.move(x, y)
+            self._moves[(x, y)] = seq
+            return seq
+
+    def color(self, col: RGB) -> str:
+        """Returns the (cached) sequence to set the foreground color"""
+        key = (col.r, col.g, col.b)
+        try:
+            return self._colors[key]
+        except KeyError:
+            seq = self._colors[key] = col.pr(self._term)
+            return seq
+
+    def _diff(self, out: bytearray) -> bool:
+        """Append to `out` the UTF-8 sequences updating the changed cells and mark
+        them as shown. Returns True if any cell changed.
+        """
+        changed = False
+        last_col = None
+        for x in range(self.height):
+            chars, cols = self._chars[x], self._cols[x]
+            shown_chars, shown_cols = self._shown_chars[x], self._shown_cols[x]
+            if chars == shown_chars and cols == shown_cols:
+                continue
+
+            # each row is encoded once and appended to the frame bytes
+            parts: List[str] = []
+            cursor = -1  # column following the last cell printed, -1: none
+            for y in range(self.width):
+                c = chars[y]
+                if c is None or (c == shown_chars[y] and cols[y] == shown_cols[y]):
+                    continue
+                if y != cursor:
+                    # Reprinting up to 2 unchanged cells in the current color is
+                    # never longer than moving the cursor over them
+                    gap = range(cursor, y)
+                    if (
+                        cursor > 0
+                        and len(gap) <= 2
+                        and all(cols[i] == last_col for i in gap)
+                    ):
+                        parts.extend(chars[cursor:y])
+                    else:
+                        parts.append(self.move(x, y))
+                cursor = y + 1
+                if cols[y] != last_col:
+                    last_col = cols[y]
+                    parts.append(last_col)
+                parts.append(c)
+                shown_chars[y] = c
+                shown_cols[y] = cols[y]
+
+            if parts:
+                out += "".join(parts).encode("utf-8")
+                changed = True
+
+        return changed
 
     def print(self) -> None:
-        """Render buffer on screen"""
-        print("".join(self._buf))
+        """Render the changes on screen with a single write and flush"""
+        # The frame is accumulated as bytes, ready to be written out
+        frame = bytearray(_frame_begin)
+        if self._diff(frame):
+            frame += _frame_end
+        else:
+            # only frames with changed cells need to be painted atomically
+            frame.clear()
+        frame += "".join(self._tail).encode("utf-8")
+
+        stdout = sys.stdout
+        # flush any pending text first to preserve ordering
+        stdout.flush()
+        raw = getattr(stdout, "buffer", None)
+        if raw is None:
+            # e.g. stdout replaced by a StringIO
+            stdout.write(frame.decode("utf-8"))
+            stdout.flush()
+            return
+
+        raw.write(frame)
+        raw.flush()
+
+
+class _Redraw:
+    """Tile attribute that marks the tile for redraw when assigned. The value is
+    stored in the slot with the same name prefixed by an underscore.
+    """
+
+    __slots__ = ["_slot"]
+
+    def __set_name__(self, owner, name: str) -> None:
+        self._slot = "_" + name
+
+    def __get__(self, tile, owner=None):
+        if tile is None:
+            return self
+        return getattr(tile, self._slot)
+
+    def __set__(self, tile, value) -> None:
+        setattr(tile, self._slot, value)
+        tile._dirty = True
 
 
 class Tile:
     """Base class for all Dashing tiles."""
 
+    # "__dict__" keeps accepting arbitrary attributes, e.g. metadata set by users
+    __slots__ = [
+        "__dict__",
+        "_title",
+        "max_fps",
+        "_last_frame_ts",
+        "_terminal",
+        "_move_cache",
+        "_color_cache",
+        "_buf",
+        "_border_cache",
+        "parent",
+        "_dirty",
+        "_shown_tbox",
+        "_shown_tiles",
+        "_style_cache",
+        "items",
+        "_border",
+        "_text_color",
+        "_border_color",
+        "_color_high",
+        "_color_low",
+    ]
+
     def __init__(
         self,
         title: str = "",
@@ -268,16 +567,37 @@ class Tile:
         color: Color = None,
         color_high: Color = None,
         color_low: Color = None,
+        max_fps: Optional[float] = None,
     ) -> None:
         """
         :param title: Title of the tile
         :param border_color: Setting this will enable a
          border and shrinks available size by 1 character on each side.
         :param color: Color of the text inside the tile.
+        :param max_fps: Used on the root tile: skip :meth:`display` calls coming
+         sooner than 1 / max_fps seconds after the previous frame. Changes are
+         shown by the next call that is not skipped.
         """
         self.title = title
+        self.max_fps = max_fps
+        self._last_frame_ts = 0.0
         self._terminal: Optional[Terminal] = None
+        # escape sequences cache, used only on the root tile
+        self._move_cache: Dict[Tuple[int, int], str] = {}
+        self._color_cache: Dict[Tuple[int, int, int], str] = {}
+        # screen buffer, used only on the root tile
+        self._buf: Optional[_Buf] = None
+        # borders and title layout, with the box and settings it was built for
+        self._border_cache: Optional[tuple] = None
         self.parent: Optional[Tile] = None
+        # set when the tile needs to be redrawn
+        self._dirty = True
+        # box the tile was drawn into by the previous frame
+        self._shown_tbox: Optional[TBox] = None
+        # tiles of the tree as of the previous frame, used only on the root tile
+        self._shown_tiles: List[Tile] = []
+        # colors resolved by _inherit_style
+        self._style_cache: Dict[str, RGB] = {}
         self.items: List[Tile] = []
 
         self.border = border  # bool
@@ -286,17 +606,58 @@ class Tile:
         self._color_high = _initcol(color_high)
         self._color_low = _initcol(color_low)
 
+    title = _Redraw()
+    border = _Redraw()
+
+    # Tile types setting this to True mark themselves dirty whenever their content
+    # changes, and are skipped by display() otherwise. The others are redrawn on
+    # every frame. Subclasses do not inherit it, as they may draw state of their own.
+    dirty_tracking = False
+
+    def __init_subclass__(cls, **kw) -> None:
+        super().__init_subclass__(**kw)
+        cls.dirty_tracking = cls.__dict__.get("dirty_tracking", False)
+
+    def mark_dirty(self) -> None:
+        """Redraw this tile and the tiles nested in it on the next :meth:`display`.
+        Needed after changing their content in place, e.g. appending to
+        ``datapoints`` directly or modifying an :class:`RGB` used as a color.
+        """
+        stack = [self]
+        while stack:
+            tile = stack.pop()
+            tile._dirty = True
+            stack.extend(tile.items)
+
     def _inherit_style(self, name: str) -> RGB:
+        try:
+            return self._style_cache[name]
+        except KeyError:
+            pass
+
         priv = f"_{name}"
-        if getattr(self, priv):
-            return getattr(self, priv)
+        col = getattr(self, priv)
+        if col:
+            pass
         elif self.parent:
-            return getattr(self.parent, name)
+            col = getattr(self.parent, name)
         else:
             # I'm the root element
             col = RGB(128, 128, 128)
             setattr(self, priv, col)
-            return col
+
+        self._style_cache[name] = col
+        return col
+
+    def _reset_style_cache(self) -> None:
+        """Forget the colors resolved by this tile and its descendants"""
+        stack = [self]
+        while stack:
+            tile = stack.pop()
+            tile._style_cache.clear()
+            # the inherited colors may have changed
+            tile._dirty = True
+            stack.extend(tile.items)
 
     @property
     def text_color(self) -> RGB:
@@ -330,6 +691,8 @@ class Tile:
 
         if isinstance(value, RGB | None):
             setattr(self, f"_{name}", value)
+            self._reset_style_cache()
+            self._dirty = True
             return
 
         raise ValueError(f"Invalid color type {type(value)}")
@@ -346,18 +709,42 @@ class Tile:
         Draw borders and title as needed and returns
         inset (x, y, width, height)
         """
+        key = (tbox, self.title, self.border)
+        cache = self._border_cache
+        if cache is None or cache[0] != key:
+            cache = self._border_cache = (key, *self._layout_borders_and_title(tbox))
+
+        _, lines, inset = cache
+        col = buf.color(self.border_color)
+        for x, y, text, vertical in lines:
+            if vertical:
+                buf.put_column(x, y, text, col)
+            else:
+                buf.put(x, y, text, col)
+
+        return inset
+
+    def _layout_borders_and_title(
+        self, tbox: TBox
+    ) -> Tuple[List[Tuple[int, int, str, bool]], TBox]:
+        """
+        Build the border and title strings with their positions, whether they
+        are vertical and the inset (x, y, width, height)
+        """
+        lines = []
         if self.border:
-            buf.add(self.border_color.pr(tbox.t))
             # left and right
-            for dx in range(1, tbox.h - 1):
-                buf.add(tbox.t.move(tbox.x + dx, tbox.y) + border_v)
-                buf.add(tbox.t.move(tbox.x + dx, tbox.y + tbox.w - 1) + border_v)
+            side = border_v * (tbox.h - 2)
+            lines.append((tbox.x + 1, tbox.y, side, True))
+            lines.append((tbox.x + 1, tbox.y + tbox.w - 1, side, True))
             # bottom
-            buf.add(
-                tbox.t.move(tbox.x + tbox.h - 1, tbox.y),
-                border_bl,
-                border_h * (tbox.w - 2),
-                border_br,
+            lines.append(
+                (
+                    tbox.x + tbox.h - 1,
+                    tbox.y,
+                    border_bl + border_h * (tbox.w - 2) + border_br,
+                    False,
+                )
             )
             if self.title:
                 # top border with title
@@ -371,29 +758,30 @@ class Tile:
                 border_t = border_h * (tbox.w - 2)
 
             # top
-            buf.add(tbox.t.move(tbox.x, tbox.y), border_tl, border_t, border_tr)
+            lines.append((tbox.x, tbox.y, border_tl + border_t + border_tr, False))
 
         elif self.title:
             # top title without border
             margin = int((tbox.w - len(self.title)) / 20)
 
-            title = (
-                " " * margin + self.title + " " * (tbox.w - margin - len(self.title))
-            )
-            buf.add(tbox.t.move(tbox.x, tbox.y) + title)
+            title = (" " * margin + self.title).ljust(tbox.w)
+            lines.append((tbox.x, tbox.y, title, False))
 
         if self.border:
-            return TBox(tbox.t, tbox.x + 1, tbox.y + 1, tbox.w - 2, tbox.h - 2)
+            return lines, TBox(tbox.t, tbox.x + 1, tbox.y + 1, tbox.w - 2, tbox.h - 2)
 
         elif self.title:
-            return TBox(tbox.t, tbox.x + 1, tbox.y, tbox.w - 0, tbox.h - 1)
+            return lines, TBox(tbox.t, tbox.x + 1, tbox.y, tbox.w - 0, tbox.h - 1)
 
-        return TBox(tbox.t, tbox.x, tbox.y, tbox.w, tbox.h)
+        return lines, TBox(tbox.t, tbox.x, tbox.y, tbox.w, tbox.h)
 
     def _fill_area(self, buf: _Buf, tbox: TBox, char: str) -> None:
         """Fill area with a character"""
+        # every row is the same
+        row = char * tbox.w
+        cols = [buf.color(self.text_color)] * len(row)
         for dx in range(0, tbox.h):
-            buf.add(tbox.t.move(tbox.x + dx, tbox.y) + char * tbox.w)
+            buf.put_cells(tbox.x + dx, tbox.y, row, cols)
 
     def _fill_screen_with_symbol(self, buf: _Buf) -> None:
         """Used for debugging"""
@@ -407,18 +795,76 @@ class Tile:
             self._terminal = terminal or Terminal()
 
         t = self._terminal
-        tbox = TBox(t, 0, 0, t.width, t.height - 1)
+        width, height = t.width, t.height
+        buf = self._buf
+
+        # Skip the frame if no tile changed, was added or removed. Tiles without
+        # dirty tracking may have changed at any time.
+        tiles: List[Tile] = []
+        walk = [self]
+        while walk:
+            tile = walk.pop()
+            tiles.append(tile)
+            walk.extend(tile.items)
+        if (
+            buf is not None
+            and (buf.width, buf.height) == (width, height)
+            and tiles == self._shown_tiles
+            and not any(tile._dirty or not tile.dirty_tracking for tile in tiles)
+        ):
+            return
 
-        # Recurse into nested splits filling `buf`
-        buf = _Buf()
-        self._display(buf, tbox)
+        now = time.monotonic()
+        if buf is not None and self.max_fps:
+            if now - self._last_frame_ts < 1 / self.max_fps:
+                return
+        self._last_frame_ts = now
+
+        # Redraw every tile if the tree changed
+        redraw = tiles != self._shown_tiles
+        if buf is None or (buf.width, buf.height) != (width, height):
+            # first frame or the terminal has been resized: redraw everything
+            # and drop the moves to positions that may now be off screen, so that
+            # the cache stays bounded by the screen size
+            self._move_cache.clear()
+            buf = self._buf = _Buf(
+                t, self._move_cache, self._color_cache, width, height
+            )
+            redraw = True
+        else:
+            buf.clear()
+
+        # Walk the nested splits filling `buf`, using a stack rather than
+        # recursion. Children are pushed in reverse to keep the drawing order.
+        # Tiles left undrawn keep their cells on screen: skip the unchanged ones.
+        # Each tile is clipped to its box, so it cannot draw over a skipped one.
+        stack: List[Tuple[Tile, TBox]] = [(self, TBox(t, 0, 0, width, height - 1))]
+        while stack:
+            tile, tbox = stack.pop()
+            if isinstance(tile, Split):
+                buf.clip(tbox)
+                stack.extend(reversed(tile._layout(buf, tbox)))
+            elif (
+                redraw
+                or tile._dirty
+                or not tile.dirty_tracking
+                or tile._shown_tbox != tbox
+            ):
+                buf.clip(tbox)
+                tile._display(buf, tbox)
+                tile._shown_tbox = tbox
+        buf.clip(None)
 
         # park cursor in a safe place and reset color
-        buf.add(t.move(t.height - 3, 0), self.border_color.pr(t))
+        buf.add(buf.move(height - 3, 0), buf.color(self.border_color))
 
         # Print the whole thing
         buf.print()
 
+        for tile in tiles:
+            tile._dirty = False
+        self._shown_tiles = tiles
+
 
 class Split(Tile):
     """Split a box vertically (VSplit) or horizontally (HSplit)
@@ -428,11 +874,17 @@ class Split(Tile):
     Initialize them with border=True to add it.
     """
 
+    __slots__ = ["_layout_cache"]
+    dirty_tracking = True
+
     def __init__(self, *items: Tile, border=False, **kw) -> None:
         # `border = False` is the default for Split. Pass it to super().__init__
         kw["border"] = border
         super().__init__(**kw)
         self.items: List[Tile] = list(items)
+        # items boxes and leftover area, with the box and items count they were
+        # computed for
+        self._layout_cache: Optional[tuple] = None
         self.update_children()
 
     def update_children(self) -> None:
@@ -441,57 +893,82 @@ class Split(Tile):
         """
         for i in self.items:
             i.parent = self
+            i._reset_style_cache()
 
-
-class VSplit(Split):
-    """Vertical Split"""
-
-    def _display(self, buf: _Buf, tbox: TBox) -> None:
-        """Render current tile and its items. Recurse into nested splits"""
+    def _layout(self, buf: _Buf, tbox: TBox) -> List[Tuple[Tile, TBox]]:
+        """Draw borders and leftover area, return the items with their boxes"""
         tbox = self._draw_borders_and_title(buf, tbox)
         if not self.items:
             # empty split
             # self._fill_area(tbox, " ")
-            return
+            return []
+
+        key = (tbox, len(self.items))
+        if self._layout_cache is None or self._layout_cache[0] != key:
+            self._layout_cache = (key, *self._split(tbox))
+
+        _, boxes, leftover = self._layout_cache
+        if leftover is not None:
+            self._fill_area(buf, leftover, " ")
+
+        return list(zip(self.items, boxes))
+
+    def _split(self, tbox: TBox) -> Tuple[List[TBox], Optional[TBox]]:
+        """Returns the boxes of the items and the leftover area, if any"""
+        raise NotImplementedError
+
+    def _display(self, buf: _Buf, tbox: TBox) -> None:
+        """Render current tile and its items. Recurse into nested splits"""
+        for item, item_tbox in self._layout(buf, tbox):
+            item._display(buf, item_tbox)
+
+
+class VSplit(Split):
+    """Vertical Split"""
+
+    __slots__ = ()
+    dirty_tracking = True
 
+    def _split(self, tbox: TBox) -> Tuple[List[TBox], Optional[TBox]]:
         item_height = tbox.h // len(self.items)
         item_width = tbox.w
 
         x = tbox.x
-        for i in self.items:
-            i._display(buf, TBox(tbox.t, x, tbox.y, item_width, item_height))
+        boxes = []
+        for _ in self.items:
+            boxes.append(TBox(tbox.t, x, tbox.y, item_width, item_height))
             x += item_height
 
-        # Fill leftover area
-        leftover_x = tbox.h - x + 1
+        # Leftover area
+        leftover_x = tbox.x + tbox.h - x
         if leftover_x > 0:
-            self._fill_area(buf, TBox(tbox.t, x, tbox.y, tbox.w, leftover_x), " ")
+            return boxes, TBox(tbox.t, x, tbox.y, tbox.w, leftover_x)
+
+        return boxes, None
 
 
 class HSplit(Split):
     """Horizontal Split"""
 
-    def _display(self, buf: _Buf, tbox: TBox) -> None:
-        """Render current tile and its items. Recurse into nested splits"""
-        # apply default theme on root element
-        tbox = self._draw_borders_and_title(buf, tbox)
-        if not self.items:
-            # empty split
-            # self._fill_area(tbox, " ")
-            return
+    __slots__ = ()
+    dirty_tracking = True
 
+    def _split(self, tbox: TBox) -> Tuple[List[TBox], Optional[TBox]]:
         item_height = tbox.h
         item_width = tbox.w // len(self.items)
 
         y = tbox.y
-        for i in self.items:
-            i._display(buf, TBox(tbox.t, tbox.x, y, item_width, item_height))
+        boxes = []
+        for _ in self.items:
+            boxes.append(TBox(tbox.t, tbox.x, y, item_width, item_height))
             y += item_width
 
-        # Fill leftover area
-        leftover_y = tbox.w - y + 1
+        # Leftover area
+        leftover_y = tbox.y + tbox.w - y
         if leftover_y > 0:
-            self._fill_area(buf, TBox(tbox.t, tbox.x, y, leftover_y - 1, tbox.h), " ")
+            return boxes, TBox(tbox.t, tbox.x, y, leftover_y, tbox.h)
+
+        return boxes, None
 
 
 class Text(Tile):
@@ -502,19 +979,24 @@ class Text(Tile):
 
     """
 
+    __slots__ = ["_text", "_lines"]
+    dirty_tracking = True
+
+    text = _Redraw()
+
     def __init__(self, text: str, color: Color = None, **kw) -> None:
         super().__init__(**kw)
-        self.text: str = text
+        self.text = text
+        # text and its lines, split only when the text changes
+        self._lines: Optional[Tuple[str, List[str]]] = None
 
     def _display(self, buf: _Buf, tbox: TBox) -> None:
-        tbox = self._draw_borders_and_title(buf, tbox)
-        for dx, line in _pad(self.text.splitlines()[-(tbox.h) :], tbox.h):
-            buf.add(
-                self.text_color.pr(tbox.t),
-                tbox.t.move(tbox.x + dx, tbox.y),
-                line,
-                " " * (tbox.w - len(line)),
-            )
+        _, x, y, w, h = self._draw_borders_and_title(buf, tbox)
+        col = buf.color(self.text_color)
+        if self._lines is None or self._lines[0] != self.text:
+            self._lines = (self.text, self.text.splitlines())
+        for dx, line in _pad(self._lines[1][-h:], h):
+            buf.put(x + dx, y, line.ljust(w), col)
 
 
 class Log(Tile):
@@ -522,38 +1004,48 @@ class Log(Tile):
     Add new lines with :meth:`append`
     """
 
+    __slots__ = ["_logs"]
+    dirty_tracking = True
+
+    logs = _Redraw()
+
     def __init__(self, **kw) -> None:
         super().__init__(**kw)
-        self.logs: deque = deque(maxlen=50)
+        self.logs = deque(maxlen=50)
 
     def _display(self, buf: _Buf, tbox: TBox) -> None:
         # TODO: support low -> high -> low gradient
-        tbox = self._draw_borders_and_title(buf, tbox)
-        n_logs = len(self.logs)
-        log_range = min(n_logs, tbox.h)
+        _, x, y, w, h = self._draw_borders_and_title(buf, tbox)
+        logs = self.logs
+        n_logs = len(logs)
+        log_range = min(n_logs, h)
         start = n_logs - log_range
 
-        for dx, line in _pad((self.logs[ln] for ln in range(start, n_logs)), tbox.h):
-            col = interpolate_colors(self.color_high, self.color_low, tbox.h, dx)
-            buf.add(
-                col.pr(tbox.t),
-                tbox.t.move(tbox.x + dx, tbox.y),
-                line,
-                " " * (tbox.w - len(line)),
-            )
+        grad = _gradient(tuple(self.color_high), tuple(self.color_low), h, h)
+        for dx, line in _pad(itertools.islice(logs, start, None), h):
+            buf.put(x + dx, y, line.ljust(w), buf.color(grad[dx]))
 
     def append(self, msg: str) -> None:
         """Append a new log message at the bottom"""
         self.logs.append(msg)
+        self._dirty = True
 
 
 class HGauge(Tile):
     """Horizontal gauge"""
 
+    __slots__ = ["_value", "_label", "_gradient_seqs"]
+    dirty_tracking = True
+
+    value = _Redraw()
+    label = _Redraw()
+
     def __init__(self, label: str = "", val=100, color: Color = None, **kw) -> None:
         super().__init__(color=color, **kw)
         self.value = val
         self.label = label
+        # gradient color sequences, with the size and colors they were built for
+        self._gradient_seqs: Optional[tuple] = None
 
     def _display(self, buf: _Buf, tbox: TBox) -> None:
         tbox = self._draw_borders_and_title(buf, tbox)
@@ -565,53 +1057,67 @@ class HGauge(Tile):
             label_wid = len(self.label)
             bar_wid = (tbox.w - label_wid - 3) * self.value / 100
             v_center = int((tbox.h) * 0.5)
-            bar_iwid = int(bar_wid)
+            frac, bar_iwid = _split_float(bar_wid)
             filler_wid = tbox.w - bar_iwid - label_wid - 2
 
         else:
             label_wid = 0
             bar_wid = tbox.w * self.value / 100.0
             v_center = None
-            bar_iwid = int(bar_wid)
+            frac, bar_iwid = _split_float(bar_wid)
             filler_wid = tbox.w - bar_iwid - 1
 
-        # Stores a row of the gauge (colored bar + filler)
-        blk: List[str] = []
-
-        # Fill the colored part
-        for pos in range(bar_iwid):
-            col = interpolate_colors(
-                self.color_high, self.color_low, (bar_iwid + filler_wid), pos
-            )
-            blk.append(col.pr(tbox.t))
-            blk.append(hbar_elements[-1])  # full element
-
-        # Pick the char for the partially-filled element
-        selector = int((bar_wid - int(bar_wid)) * 7)
-        blk.append(hbar_elements[selector])
-
-        # Fill the remaining part with thin lines
-        blk.append(self.text_color.pr(tbox.t))
-        blk.append(hbar_elements[0] * filler_wid)
-
-        # Assemble the pieces
+        # The color sequences of the whole gradient only depend on the size of the
+        # tile and on its colors: build them once and slice them on every frame
+        steps = bar_iwid + filler_wid
+        high, low = tuple(self.color_high), tuple(self.color_low)
+        key = (tbox.t, steps, high, low)
+        if self._gradient_seqs is None or self._gradient_seqs[0] != key:
+            grad = _gradient(high, low, steps, max(steps, 0))
+            self._gradient_seqs = (key, [buf.color(col) for col in grad])
+
+        if bar_iwid <= steps:
+            blk_cols = self._gradient_seqs[1][: max(bar_iwid, 0)]
+        else:
+            # overflowing value
+            grad = _gradient(high, low, steps, bar_iwid)
+            blk_cols = [buf.color(col) for col in grad]
+
+        # A row of the gauge: full elements, the partially-filled element
+        # and the filler made of thin lines
+        selector = int(frac * 7)
+        bar = (
+            hbar_elements[-1] * bar_iwid
+            + hbar_elements[selector]
+            + hbar_elements[0] * filler_wid
+        )
+        text_col = buf.color(self.text_color)
+        blk_cols.append(blk_cols[-1] if blk_cols else text_col)
+        blk_cols.extend([text_col] * max(filler_wid, 0))
+
+        # Assemble the pieces: the label is drawn on the central row only
+        label = self.label
+        label_prefix = label + " " if label else ""
+        blank_prefix = " " * len(label_prefix)
+        x, y = tbox.x, tbox.y
+        bar_y = y + len(label_prefix)
         for dx in range(0, tbox.h):
-            m = tbox.t.move(tbox.x + dx, tbox.y)
-            if self.label:
-                if dx == v_center:
-                    # draw label
-                    buf.add(m + self.label + " ")
-                else:
-                    buf.add(m + " " * label_wid + " ")
-            else:
-                buf.add(m)
-
-            buf.add(*blk)
+            prefix = label_prefix if dx == v_center else blank_prefix
+            buf.put(x + dx, y, prefix, text_col)
+            buf.put_cells(x + dx, bar_y, bar, blk_cols)
 
 
 class VGauge(Tile):
     """Vertical gauge"""
 
+    __slots__ = ["_value"]
+    dirty_tracking = True
+
+    value = _Redraw()
+
+    # blank row and rows made of each of the vbar_elements, by width
+    _rows: Dict[int, Tuple[str, Tuple[str, ...]]] = {}
+
     def __init__(self, val=100, color: Color = None, **kw) -> None:
         super().__init__(color=color, **kw)
         self.value = val
@@ -620,180 +1126,234 @@ class VGauge(Tile):
         """Render current tile"""
         tbox = self._draw_borders_and_title(buf, tbox)
         nh = tbox.h * (self.value / 100.5)
-        buf.add(tbox.t.move(tbox.x, tbox.y) + self.text_color.pr(tbox.t))
-        for dx in range(tbox.h):
-            m = tbox.t.move(tbox.x + tbox.h - dx - 1, tbox.y)
-            buf.add(m)
-            col = interpolate_colors(self.color_high, self.color_low, tbox.h, dx)
-            buf.add(col.pr(tbox.t))
-            if dx < int(nh):
-                # full element
-                buf.add(vbar_elements[-1] * tbox.w)
-            elif dx == int(nh):
-                # fractional element
-                index = int((nh - int(nh)) * 8)
-                buf.add(vbar_elements[index] * tbox.w)
-            else:
-                buf.add(" " * tbox.w)
+        grad = _gradient(tuple(self.color_high), tuple(self.color_low), tbox.h, tbox.h)
+        try:
+            blank, rows = self._rows[tbox.w]
+        except KeyError:
+            blank, rows = self._rows.setdefault(
+                tbox.w, (" " * tbox.w, tuple(e * tbox.w for e in vbar_elements))
+            )
+        # Rows from the bottom: full elements, the fractional element, blanks
+        frac, top = _split_float(nh)
+        if top < 0:
+            bars = [blank] * tbox.h
+        else:
+            bars = [rows[-1]] * top + [rows[int(frac * 8)]]
+            bars += [blank] * (tbox.h - len(bars))
+
+        bottom, y = tbox.x + tbox.h - 1, tbox.y
+        for dx, (bar, col) in enumerate(zip(bars, grad)):
+            buf.put(bottom - dx, y, bar, buf.color(col))
 
 
 class VChart(Tile):
     """Vertical chart. Values must be between 0 and 100 and can be float."""
 
+    __slots__ = ["_value", "_datapoints"]
+    dirty_tracking = True
+
+    value = _Redraw()
+    datapoints = _Redraw()
+
     def __init__(self, val=100, **kw) -> None:
         super().__init__(**kw)
         self.value = val
-        self.datapoints: deque = deque(maxlen=50)
+        self.datapoints = deque(maxlen=50)
 
     def append(self, dp: float) -> None:
         """Append a new value: int or float between 1 and 100"""
         self.datapoints.append(dp)
+        self._dirty = True
 
     def _display(self, buf: _Buf, tbox: TBox) -> None:
-        tbox = self._draw_borders_and_title(tbox)
-        filled_element = hbar_elements[-1]
-        scale = tbox.w / 100.0
-        buf.add(self.text_color.pr(tbox.t))
-        for dx in range(tbox.h):
-            index = 50 - (tbox.h) + dx
-            try:
-                dp = self.datapoints[index] * scale
-                index = int((dp - int(dp)) * 8)
-                bar = filled_element * int(dp) + hbar_elements[index]
-                assert len(bar) <= tbox.w, dp
-                bar += " " * (tbox.w - len(bar))
-            except IndexError:
-                bar = " " * tbox.w
-            buf.add(tbox.t.move(tbox.x + dx, tbox.y) + bar)
+        tbox = self._draw_borders_and_title(buf, tbox)
+        # local names for the loop
+        elements = hbar_elements
+        _, x, y, w, h = tbox
+        # rows are sliced out of these
+        full = elements[-1] * w
+        blank = " " * w
+        scale = w / 100.0
+        col = buf.color(self.text_color)
+        # copy the datapoints once: indexing a deque is O(n)
+        datapoints = list(self.datapoints)
+        n_dps = len(datapoints)
+        start = 50 - h
+        for dx in range(h):
+            index = start + dx
+            if not -n_dps <= index < n_dps:
+                # no datapoint (yet): check the bounds rather than catching
+                # IndexError, which is slow when most rows are empty
+                buf.put(x + dx, y, blank, col)
+                continue
+            frac, n = _split_float(datapoints[index] * scale)
+            # hbar_elements has 7 glyphs: a fraction above 7/8 used to
+            # overflow the index and blank the whole row
+            bar = full[: max(n, 0)] + elements[min(int(frac * 8), 6)]
+            # 100 or more fills the whole row
+            buf.put(x + dx, y, bar[:w].ljust(w), col)
 
 
 class HChart(Tile):
     """Horizontal chart, filled"""
 
+    __slots__ = ["_value", "_datapoints"]
+    dirty_tracking = True
+
+    value = _Redraw()
+    datapoints = _Redraw()
+
     def __init__(self, val=100, **kw) -> None:
         super().__init__(**kw)
         self.value = val
-        self.datapoints: deque = deque(maxlen=500)
+        self.datapoints = deque(maxlen=500)
 
     def append(self, dp: float) -> None:
         """Append a new value: int or float between 1 and 100"""
         self.datapoints.append(dp)
+        self._dirty = True
 
     def _display(self, buf: _Buf, tbox: TBox) -> None:
         tbox = self._draw_borders_and_title(buf, tbox)
-        buf.add(self.text_color.pr(tbox.t))
-        for dx in range(tbox.h):
-            bar = ""
-            for dy in range(tbox.w):
-                dp_index = -tbox.w + dy
-                try:
-                    dp = self.datapoints[dp_index]
-                    q = (1 - dp / 100) * tbox.h
-                    if dx == int(q):
-                        index = int((int(q) - q) * 8 - 1)
-                        bar += vbar_elements[index]
-                    elif dx < int(q):
-                        bar += " "
-                    else:
-                        bar += vbar_elements[-1]
-
-                except IndexError:
-                    bar += " "
-
-            # assert len(bar) == tbox.w
-            buf.add(tbox.t.move(tbox.x + dx, tbox.y) + bar)
+        col = buf.color(self.text_color)
+        _, x, y, w, h = tbox
+        elements = vbar_elements
+        full = elements[-1] * max(h, 0)
+        blank = " " * max(h, 0)
+        # Build each column top to bottom: blanks, the glyph at the top of the
+        # bar then full elements. Missing datapoints render as blanks.
+        columns = []
+        for dp in _tail(self.datapoints, w):
+            if dp is None:
+                columns.append(blank)
+                continue
+            q = (1 - dp / 100) * h
+            top = int(q)
+            if top < 0:
+                columns.append(full)
+                continue
+            glyph = elements[int((top - q) * 8 - 1)]
+            columns.append((blank[:top] + glyph + full)[:h])
+
+        # transpose the columns into rows
+        for dx, row in enumerate(zip(*columns)):
+            buf.put(x + dx, y, "".join(row), col)
 
 
 class HBrailleChart(Tile):
     """Horizontal chart made with dots"""
 
+    __slots__ = ["_value", "_datapoints"]
+    dirty_tracking = True
+
+    value = _Redraw()
+    datapoints = _Redraw()
+
     def __init__(self, val=100, **kw) -> None:
         super().__init__(**kw)
         self.value = val
-        self.datapoints: deque = deque(maxlen=500)
+        self.datapoints = deque(maxlen=500)
 
     def append(self, dp: float) -> None:
         """Append a new value: int or float between 1 and 100"""
         self.datapoints.append(dp)
+        self._dirty = True
 
     def _display(self, buf: _Buf, tbox: TBox) -> None:
         tbox = self._draw_borders_and_title(buf, tbox)
-        buf.add(self.text_color.pr(tbox.t))
-        for dx in range(tbox.h):
-            bar = ""
-            for dy in range(tbox.w):
-                dp_index = (dy - tbox.w) * 2
-                try:
-                    dp1 = self.datapoints[dp_index]
-                    dp2 = self.datapoints[dp_index + 1]
-                except IndexError:
-                    # no data (yet)
-                    bar += " "
-                    continue
-
-                q1 = (1 - dp1 / 100) * tbox.h
-                q2 = (1 - dp2 / 100) * tbox.h
-                if dx == int(q1):
-                    index1 = int((q1 - int(q1)) * 4)
-                    if dx == int(q2):  # both datapoints in the same rune
-                        index2 = int((q2 - int(q2)) * 4)
-                    else:
-                        index2 = -1  # no dot
-                    bar += _generate_braille(index1, index2)
-                elif dx == int(q2):
-                    # the right dot only is in the current rune
-                    index2 = int((q2 - int(q2)) * 4)
-                    bar += _generate_braille(-1, index2)
-                else:
-                    bar += " "
-
-            buf.add(tbox.t.move(tbox.x + dx, tbox.y) + bar)
+        col = buf.color(self.text_color)
+        # Each column (rune) shows 2 datapoints, at most on 2 different rows:
+        # start from blank rows and set only the runes holding a dot
+        _, x, y, w, h = tbox
+        runes = _braille_runes
+        rows = [[" "] * w for _ in range(h)]
+        pts = _tail(self.datapoints, w * 2)
+        for dy, (dp1, dp2) in enumerate(zip(pts[::2], pts[1::2])):
+            if dp1 is None:
+                # no data (yet)
+                continue
+            q1 = (1 - dp1 / 100) * h
+            q2 = (1 - dp2 / 100) * h
+            row1, index1 = int(q1), int((q1 - int(q1)) * 4)
+            row2, index2 = int(q2), int((q2 - int(q2)) * 4)
+            if row1 == row2:
+                if 0 <= row1 < h:
+                    rows[row1][dy] = runes[index1][index2]
+                continue
+            # the runes hold one dot each, the other index is -1 (no dot)
+            if 0 <= row1 < h:
+                rows[row1][dy] = runes[index1][-1]
+            if 0 <= row2 < h:
+                rows[row2][dy] = runes[-1][index2]
+
+        for dx, row in enumerate(rows):
+            buf.put(x + dx, y, "".join(row), col)
 
 
 class HBrailleFilledChart(Tile):
     """Horizontal chart, filled with dots"""
 
+    __slots__ = ["_value", "_datapoints"]
+    dirty_tracking = True
+
+    value = _Redraw()
+    datapoints = _Redraw()
+
     def __init__(self, val=100, **kw) -> None:
         super().__init__(**kw)
         self.value = val
-        self.datapoints: deque = deque(maxlen=500)
+        self.datapoints = deque(maxlen=500)
 
     def append(self, dp: float) -> None:
         """Append a new value: int or float between 1 and 100"""
         self.datapoints.append(dp)
+        self._dirty = True
 
     def _display(self, buf: _Buf, tbox: TBox) -> None:
         tbox = self._draw_borders_and_title(buf, tbox)
-        buf.add(self.text_color.pr(tbox.t))
-        for dx in range(tbox.h):
-            bar = ""
-            for dy in range(tbox.w):
-                dp_index = (dy - tbox.w) * 2
-                try:
-                    dp1 = self.datapoints[dp_index]
-                    dp2 = self.datapoints[dp_index + 1]
-                except IndexError:
-                    # no data (yet)
-                    bar += " "
-                    continue
+        col = buf.color(self.text_color)
+        _, x, y, w, h = tbox
+        runes = _filled_braille_runes
+        # Each column (rune) shows 2 datapoints. Going down a column each side is
+        # empty above its top row and filled below it: build the column with a
+        # few string repetitions from row -1 to row h, then drop the extra rows.
+        columns = []
+        pts = _tail(self.datapoints, w * 2)
+        for dp1, dp2 in zip(pts[::2], pts[1::2]):
+            if dp1 is None:
+                # no data (yet)
+                columns.append(" " * h)
+                continue
+            q1 = (1 - dp1 / 100.0) * h
+            q2 = (1 - dp2 / 100.0) * h
+            # floor: values just above 100 must land above the chart, on row -1
+            row1, row2 = math.floor(q1), math.floor(q2)
+            # rows above the chart are dropped, their top can be anything
+            top1 = 3 - int((q1 - row1) * 4) if row1 >= 0 else 3
+            top2 = 3 - int((q2 - row2) * 4) if row2 >= 0 else 3
+            row1, row2 = min(max(row1, -1), h), min(max(row2, -1), h)
+            if row1 == row2:
+                column = runes[0][0] * (row1 + 1) + runes[top1][top2]
+            elif row1 < row2:
+                column = (
+                    runes[0][0] * (row1 + 1)
+                    + runes[top1][0]
+                    + runes[3][0] * (row2 - row1 - 1)
+                    + runes[3][top2]
+                )
+            else:
+                column = (
+                    runes[0][0] * (row2 + 1)
+                    + runes[0][top2]
+                    + runes[0][3] * (row1 - row2 - 1)
+                    + runes[top1][3]
+                )
+            column += runes[3][3] * (h - max(row1, row2))
+            columns.append(column[1 : h + 1])
 
-                q1 = (1 - dp1 / 100.0) * tbox.h
-                q2 = (1 - dp2 / 100.0) * tbox.h
-                if dx == int(q1):
-                    index1 = 3 - int((q1 - int(q1)) * 4)
-                elif dx > q1:
-                    index1 = 3
-                else:
-                    index1 = 0
-                if dx == int(q2):
-                    index2 = 3 - int((q2 - int(q2)) * 4)
-                elif dx > q2:
-                    index2 = 3
-                else:
-                    index2 = 0
-                bar += _generate_filled_braille(index1, index2)
-
-            buf.add(tbox.t.move(tbox.x + dx, tbox.y), bar)
+        # transpose the columns into rows
+        for dx, row in enumerate(zip(*columns)):
+            buf.put(x + dx, y, "".join(row), col)
 
 
 @contextlib.contextmanager
@@ -808,23 +1368,25 @@ def open_terminal() -> Generator:
         yield t
 
 
-def _pad(itr, n: int, fillvalue="") -> Generator:
-    i = -1
-    for i, value in enumerate(itr):
-        yield i, value
-    i += 1
-    yield from enumerate(itertools.repeat(fillvalue, n - i), i)
+def _pad(itr, n: int, fillvalue="") -> Iterator[Tuple[int, str]]:
+    """Enumerate the first `n` items, padding with `fillvalue` if needed"""
+    # boxes too small for their borders have a negative inner height
+    return enumerate(
+        itertools.islice(itertools.chain(itr, itertools.repeat(fillvalue)), max(n, 0))
+    )
 
 
-def _generate_braille(le: int, ri: int) -> str:
-    v = 0x28 * 256 + (braille_left[le] + braille_right[ri])
-    return chr(v)
+def _split_float(x: float) -> Tuple[float, int]:
+    """Returns the fractional and integer parts of `x`, both with the sign of `x`"""
+    frac, whole = math.modf(x)
+    return frac, int(whole)
 
 
-def _generate_filled_braille(lmax: int, rmax: int) -> str:
-    v = 0x28 * 256
-    for le in range(lmax):
-        v += braille_r_left[le]
-    for r in range(rmax):
-        v += braille_r_right[r]
-    return chr(v)
+def _tail(dps: deque, n: int) -> list:
+    """Returns the last `n` datapoints, left-padded with None if needed"""
+    n = max(n, 0)
+    k = min(len(dps), n)
+    # walk the deque from the right end: O(n) rather than O(len(dps))
+    tail = list(itertools.islice(reversed(dps), k))
+    tail.reverse()
+    return [None] * (n - k) + tail
@@ -1,5 +1,5 @@
 import math
-from time import sleep, time
+from time import monotonic, sleep, time
 
 from dashing import (
     ColorRangeVGauge,
@@ -63,6 +63,7 @@ if __name__ == "__main__":
     log.append("1 Hello")
     log.append("2 -----")
     prev_time = time()
+    next_tick = monotonic()
 
     with open_terminal() as terminal:
         for cycle in range(0, 100):
@@ -84,4 +85,6 @@ if __name__ == "__main__":
             # bfchart.append(50 + 50 * math.sin(cycle / 16.0))
             ui.display(terminal)
 
-            sleep(1.0 / 25)
+            # sleep until the next frame is due, whatever the rendering took
+            next_tick += 1.0 / 25
+            sleep(max(0, next_tick - monotonic()))
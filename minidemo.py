@@ -56,7 +56,7 @@ def main() -> None:
     log.append("1 Hello")
     log.append("2 World")
 
-    last_tick = time.monotonic()
+    next_tick = time.monotonic()
 
     rad = 0.0
     cnt = 0
@@ -82,8 +82,8 @@ def main() -> None:
 
         # Increase rad and sleep
         rad += 0.003
-        time.sleep(max(0, last_tick + ticker_interval - time.monotonic()))
-        last_tick = time.monotonic()
+        next_tick += ticker_interval
+        time.sleep(max(0, next_tick - time.monotonic()))
 
 
 if __name__ == "__main__":
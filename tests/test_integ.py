@@ -162,7 +162,7 @@ Dashing test run
 ┌only title──┐┌────────────┐
 │▉▉▉▉▉▉▏▏▏▏▏▏││Hello World,│
 └────────────┘│this is dashing
-.────────────┐│            │
+┌────────────┐│            │
 │only label ▋│└────────────┘
 └────────────┘┌logs────────┐
 ┌────────────┐│0 -----     │
@@ -0,0 +1,426 @@
+# Unit tests for the rendering path
+#
+# Frames are fed to a terminal emulator and incremental frames are compared with a
+# full redraw of the same UI.
+#
+# debdeps: python3-pyte python3-pytest
+
+import io
+import itertools
+import math
+import sys
+from collections import deque
+
+import pyte
+import pytest
+from blessed import Terminal
+
+import dashing
+from dashing import (
+    HBrailleChart,
+    HBrailleFilledChart,
+    HChart,
+    HGauge,
+    HSplit,
+    Log,
+    Text,
+    VChart,
+    VGauge,
+    VSplit,
+)
+
+# the UIs use the legacy ANSI color numbers, as in the integration tests
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+class SizedTerminal(Terminal):
+    """A terminal with a size set by the test"""
+
+    def __init__(self, width, height):
+        super().__init__(kind="xterm-256color", force_styling=True)
+        self.size = (width, height)
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+
+class Stdout:
+    """Captures what display() writes"""
+
+    encoding = "utf-8"
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, s):
+        self.buffer.write(s.encode("utf-8"))
+
+    def flush(self):
+        pass
+
+    def take(self):
+        out = self.buffer.getvalue()
+        self.buffer = io.BytesIO()
+        return out
+
+
+class Emulator:
+    """A terminal emulator showing what a UI displays"""
+
+    def __init__(self, width, height):
+        self.term = SizedTerminal(width, height)
+        self.screen = pyte.Screen(width, height)
+        self.stream = pyte.ByteStream(self.screen)
+
+    def resize(self, width, height):
+        self.term.size = (width, height)
+        self.screen.resize(height, width)
+
+    def display(self, ui, monkeypatch):
+        out = Stdout()
+        with monkeypatch.context() as m:
+            m.setattr(sys, "stdout", out)
+            ui.display(self.term)
+        self.stream.feed(out.take())
+
+    def cells(self):
+        """Characters and foreground colors"""
+        buf = self.screen.buffer
+        return [
+            [(buf[x][y].data, buf[x][y].fg) for y in range(self.screen.columns)]
+            for x in range(self.screen.lines)
+        ]
+
+
+def build():
+    return HSplit(
+        VSplit(
+            HGauge(val=50, title="only title", border_color=5),
+            HGauge(label="only label", val=20, border_color=5),
+            HGauge(val=20),
+            HSplit(
+                VGauge(val=0, border_color=2),
+                VGauge(val=30, border_color=2),
+                VGauge(val=95, border_color=2, color=3),
+            ),
+        ),
+        VSplit(
+            Text("Hello World,\nthis is dashing.", border_color=2),
+            Log(title="logs", border_color=5),
+            VChart(border_color=2, color=2),
+            HChart(border_color=2, color=2, title="hchart"),
+            HBrailleChart(border_color=2, color=2),
+            HBrailleFilledChart(color=2),
+        ),
+        title="Dashing test run",
+        color_high="#ff2000",
+        color_low="#0030ff",
+    )
+
+
+def update(ui, emulator, cycle):
+    """Change the UI and the terminal in a different way on each frame"""
+    left, right = ui.items
+    if cycle == 3:
+        return  # idle frame
+    if cycle == 5:
+        right.items[0].text = "Changed text\nsecond line\nthird"
+        return  # only one tile changes
+    if cycle == 6:
+        right.items[3].title = "renamed"
+    if cycle == 8:
+        emulator.resize(emulator.term.width + 7, emulator.term.height + 3)
+    if cycle == 9:
+        left.items.append(Text("added"))
+        left.update_children()
+    if cycle == 10:
+        left.items[2].set_color("text_color", "#ff0000")
+        ui.set_color("border_color", "#00ff00")
+    if cycle == 11:
+        del left.items[-1]
+    if cycle == 12:
+        emulator.resize(emulator.term.width - 20, emulator.term.height - 9)
+
+    left.items[0].value = 50 + 49.9 * math.sin(cycle / 3.0)
+    left.items[1].value = 50 + 45 * math.sin(cycle / 2.0)
+    for n, vg in enumerate(left.items[3].items):
+        vg.value = 50 + 49.9 * math.sin(cycle / 2.0 + n)
+    log, vchart, hchart, bchart, bfchart = right.items[1:]
+    for k in range(7):
+        c = cycle * 7 + k
+        vchart.append(50 + 50 * math.sin(c / 16.0))
+        hchart.append(99.9 * abs(math.sin(c / 26.0)))
+        bchart.append(50 + 50 * math.sin(c / 6.0))
+        bfchart.append(50 + 50 * math.sin(c / 9.0))
+    log.append(f"{cycle} line")
+
+
+def check_incremental(monkeypatch, build, update, width, height, frames):
+    """Display the frames incrementally and compare each one with a full redraw"""
+    ui, full_ui = build(), build()
+    emulator = Emulator(width, height)
+    full = Emulator(width, height)
+    for cycle in range(frames):
+        update(ui, emulator, cycle)
+        update(full_ui, full, cycle)
+        emulator.display(ui, monkeypatch)
+        # a new buffer redraws every tile on a blank screen
+        full_ui._buf = None
+        full.screen.reset()
+        full.display(full_ui, monkeypatch)
+        assert emulator.cells() == full.cells(), f"frame {cycle}"
+
+
+@pytest.mark.parametrize("width,height", [(80, 30), (100, 50), (47, 23)])
+def test_incremental_frames_match_full_redraw(monkeypatch, width, height):
+    check_incremental(monkeypatch, build, update, width, height, 14)
+
+
+def test_unchanged_frame_writes_nothing(monkeypatch):
+    ui = build()
+    emulator = Emulator(80, 30)
+    emulator.display(ui, monkeypatch)
+    out = Stdout()
+    monkeypatch.setattr(sys, "stdout", out)
+    ui.display(emulator.term)
+    assert out.take() == b""
+
+
+def test_buf_only_sends_changed_cells(monkeypatch):
+    term = SizedTerminal(10, 3)
+    buf = dashing._Buf(term, {}, {}, 10, 3)
+    red = buf.color(dashing.RGB(255, 0, 0))
+    out = Stdout()
+    monkeypatch.setattr(sys, "stdout", out)
+
+    buf.put(1, 2, "abcdef", red)
+    buf.print()
+    first = out.take()
+    assert b"abcdef" in first
+
+    buf.clear()
+    buf.put(1, 2, "abXdef", red)
+    buf.print()
+    second = out.take()
+    assert b"X" in second
+    assert b"abXdef" not in second
+
+    buf.clear()
+    buf.put(1, 2, "abXdef", red)
+    buf.print()
+    assert out.take() == b""
+
+
+def test_buf_clips_to_screen():
+    term = SizedTerminal(4, 2)
+    buf = dashing._Buf(term, {}, {}, 4, 2)
+    col = buf.color(dashing.RGB(1, 2, 3))
+    buf.put(0, -2, "abcdef", col)
+    buf.put(1, 2, "xyz", col)
+    buf.put(2, 0, "out", col)
+    buf.put_column(0, 3, "123", col)
+    assert buf._chars == [["c", "d", "e", "1"], [None, None, "x", "2"]]
+
+
+def test_tail():
+    dps = deque(range(10), maxlen=10)
+    assert dashing._tail(dps, 3) == [7, 8, 9]
+    assert dashing._tail(dps, 12) == [None, None] + list(range(10))
+    assert dashing._tail(dps, 0) == []
+    assert dashing._tail(dps, -1) == []
+    assert dashing._tail(deque(), 2) == [None, None]
+
+
+def test_pad():
+    assert list(dashing._pad(["a", "b"], 4)) == [(0, "a"), (1, "b"), (2, ""), (3, "")]
+    assert list(dashing._pad(iter("abcd"), 2)) == [(0, "a"), (1, "b")]
+    assert list(dashing._pad([], 2, "-")) == [(0, "-"), (1, "-")]
+    assert list(dashing._pad(["a"], 0)) == []
+    assert list(dashing._pad(["a"], -1)) == []
+    assert list(dashing._pad(iter("ab"), -3, "-")) == []
+
+
+def test_boxes_smaller_than_their_borders(monkeypatch):
+    ui = VSplit(
+        *[Text("x", border_color=2) for _ in range(3)],
+        *[Log(border_color=2) for _ in range(3)],
+    )
+    ui.items[-1].append("line")
+    emulator = Emulator(40, 10)
+    emulator.display(ui, monkeypatch)
+    assert emulator.screen.display[0].startswith("┌")
+
+
+def test_split_float():
+    assert dashing._split_float(3.25) == (0.25, 3)
+    assert dashing._split_float(-3.25) == (-0.25, -3)
+    assert dashing._split_float(0.0) == (0.0, 0)
+    assert dashing._split_float(7.0) == (0.0, 7)
+
+
+def test_braille_runes():
+    for le, ri in itertools.product(range(5), range(5)):
+        expected = chr(0x2800 + dashing.braille_left[le] + dashing.braille_right[ri])
+        assert dashing._braille_runes[le][ri] == expected
+
+
+def test_filled_braille_runes():
+    for lmax, rmax in itertools.product(range(4), range(4)):
+        expected = (
+            0x2800
+            + sum(dashing.braille_r_left[:lmax])
+            + sum(dashing.braille_r_right[:rmax])
+        )
+        assert dashing._filled_braille_runes[lmax][rmax] == chr(expected)
+
+
+def test_mark_dirty_redraws_in_place_changes(monkeypatch):
+    def update_in_place(ui, emulator, cycle):
+        left, right = ui.items
+        if cycle == 0:
+            ui.set_color("border_color", dashing.RGB(0, 255, 0))
+        elif cycle == 1:
+            right.items[2].datapoints.extend([20, 40, 60, 80])
+            right.items[1].logs.append("in place")
+            right.items[2].mark_dirty()
+            right.items[1].mark_dirty()
+        elif cycle == 2:
+            # RGB objects are mutable: the whole tree inherits this one
+            ui.border_color.g = 0
+            ui.border_color.b = 255
+            ui.mark_dirty()
+
+    check_incremental(monkeypatch, build, update_in_place, 80, 30, 3)
+
+
+def test_assigning_content_marks_dirty():
+    gauge = HGauge(val=10)
+    gauge._dirty = False
+    gauge.value = 20
+    assert gauge._dirty
+    assert gauge.value == 20
+
+    text = Text("a")
+    text._dirty = False
+    text.max_fps = 10
+    assert not text._dirty
+    text.title = "title"
+    assert text._dirty
+
+
+@pytest.mark.parametrize("value", [100, 100.5, 103, 105, 108, 110, 115, 120])
+def test_filled_braille_chart_above_100(monkeypatch, value):
+    chart = HBrailleFilledChart(border=False)
+    for _ in range(8):
+        chart.append(value)
+    emulator = Emulator(4, 11)
+    emulator.display(chart, monkeypatch)
+    full = dashing._filled_braille_runes[3][3]
+    # display() leaves the last row of the terminal empty
+    for row in emulator.screen.display[:10]:
+        assert row == full * 4
+
+
+def test_tiles_accept_arbitrary_attributes():
+    text = Text("a")
+    text.metadata = {"source": "test"}
+    assert text.metadata == {"source": "test"}
+
+
+def test_parse_color():
+    assert tuple(dashing.RGB.parse("#ff2000")) == (255, 32, 0)
+    assert tuple(dashing.RGB.parse("*102030")) == (48, 44, 41)
+    # short strings parse the digits available, as they always did
+    assert tuple(dashing.RGB.parse("#12345")) == (0x12, 0x34, 0x5)
+    for invalid in ("ff2000", "#gg0000", "#12"):
+        with pytest.raises(ValueError):
+            dashing.RGB.parse(invalid)
+
+
+def test_long_text_does_not_cover_skipped_tile(monkeypatch):
+    ui = HSplit(Text("x" * 60, border=False), Text("RIGHT", border=False))
+    emulator = Emulator(40, 6)
+    emulator.display(ui, monkeypatch)
+    ui.items[0].text = "y" * 60
+    emulator.display(ui, monkeypatch)
+    assert emulator.screen.display[0] == "y" * 20 + "RIGHT".ljust(20)
+
+
+def test_tiles_are_clipped_to_their_box(monkeypatch):
+    def build_overflowing():
+        return HSplit(
+            VSplit(
+                HGauge(label="a label longer than the gauge", val=70, border=False),
+                Log(border=False),
+                Text("t" * 50, title="a title longer than the tile", border=False),
+            ),
+            VSplit(Text("right"), HGauge(val=20), Log()),
+        )
+
+    def update_overflowing(ui, emulator, cycle):
+        left, right = ui.items
+        left.items[0].value = 10 * cycle
+        left.items[1].append(str(cycle) * 40)
+        if cycle == 2:
+            right.items[0].text = "RIGHT"
+
+    check_incremental(monkeypatch, build_overflowing, update_overflowing, 40, 20, 4)
+
+
+class Counter(dashing.Tile):
+    """A tile of the kind users write: it changes its own state between frames"""
+
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self.count = 0
+
+    def _display(self, buf, tbox):
+        tbox = self._draw_borders_and_title(buf, tbox)
+        buf.put(tbox.x, tbox.y, f"count {self.count}", buf.color(self.text_color))
+
+
+def test_custom_tiles_are_redrawn_in_partial_frames(monkeypatch):
+    ui = HSplit(Counter(), HGauge(val=10))
+    emulator = Emulator(40, 6)
+    for n in range(3):
+        ui.items[0].count = n
+        ui.items[1].value = 10 * n
+        emulator.display(ui, monkeypatch)
+        assert emulator.screen.display[1].startswith(f"│count {n}")
+
+
+def test_custom_tiles_are_redrawn_every_frame(monkeypatch):
+    ui = VSplit(Counter(title="counter"), Text("static"))
+    emulator = Emulator(30, 8)
+    for n in range(3):
+        ui.items[0].count = n
+        emulator.display(ui, monkeypatch)
+        assert emulator.screen.display[1].startswith(f"│count {n}")
+
+
+def test_opting_into_dirty_tracking(monkeypatch):
+    class TrackedCounter(Counter):
+        dirty_tracking = True
+
+    assert not type("Sub", (Text,), {}).dirty_tracking
+    ui = TrackedCounter()
+    emulator = Emulator(30, 4)
+    emulator.display(ui, monkeypatch)
+    ui.count = 1
+    emulator.display(ui, monkeypatch)
+    assert emulator.screen.display[1].startswith("│count 0")
+    ui.mark_dirty()
+    emulator.display(ui, monkeypatch)
+    assert emulator.screen.display[1].startswith("│count 1")
+
+
+def test_negative_gauge_value_draws_filler_in_text_color(monkeypatch):
+    gauge = HGauge(val=-20, border=False, color="#ff0000")
+    emulator = Emulator(10, 2)
+    emulator.display(gauge, monkeypatch)
+    assert {cell[1] for cell in emulator.cells()[0][1:]} == {"ff0000"}